@@ -102,7 +102,7 @@ def main():
     print("-" * 30)
     
     try:
-        report = pipeline.generate_summary_report(df_combined)
+        report = pipeline.generate_summary_report(df_combined, quality)
         print(report)
         
     except Exception as e:
@@ -8,15 +8,23 @@ Gère les spécificités du format français :
 - Unités locales (kg, répétitions)
 """
 
+import io
 import re
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Optional, Union
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Expressions régulières compilées une seule fois au chargement du module
+_DECIMAL_UNITS_RE = re.compile(
+    r'\s*(kg|kilogrammes?|grammes?|g|lbs?|pounds?|répétitions?|reps?)\s*', re.IGNORECASE
+)
+_WHITESPACE_RE = re.compile(r'\s+')
+_DIGITS_RE = re.compile(r'\d+')
+
 
 class CSVParserError(Exception):
     """Exception spécifique au parser CSV"""
@@ -57,6 +65,13 @@ class CSVParser:
         'skipped': ['Sautée', 'sautee', 'skipped', 'skip']
     }
     
+    # Formats de date supportés
+    DATE_FORMATS = ('%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%Y-%m-%d')
+    
+    # Valeurs booléennes reconnues (recherche O(1))
+    TRUE_VALUES = frozenset(['oui', 'yes', 'true', '1', 'vrai'])
+    FALSE_VALUES = frozenset(['non', 'no', 'false', '0', 'faux'])
+    
     def __init__(self, encoding: str = 'utf-8'):
         """
         Initialise le parser CSV.
@@ -66,6 +81,13 @@ class CSVParser:
         """
         self.encoding = encoding
         
+        # Index nom de colonne nettoyé (minuscules) -> nom standard
+        self._column_lookup = {}
+        for standard_name, possible_names in self.COLUMN_MAPPING.items():
+            for possible_name in possible_names:
+                clean_possible = self._clean_text(possible_name).lower()
+                self._column_lookup.setdefault(clean_possible, standard_name)
+        
     def parse_file(self, file_path: Union[str, Path]) -> pd.DataFrame:
         """
         Parse un fichier CSV d'entraînement.
@@ -104,10 +126,13 @@ class CSVParser:
         """Lit le CSV en testant plusieurs encodages"""
         encodings = [self.encoding, 'utf-8', 'cp1252', 'iso-8859-1']
         
+        # Une seule lecture disque : seuls les essais de décodage sont répétés
+        raw_content = file_path.read_bytes()
+        
         for encoding in encodings:
             try:
                 df = pd.read_csv(
-                    file_path,
+                    io.BytesIO(raw_content),
                     encoding=encoding,
                     sep=',',
                     quotechar='"',
@@ -121,37 +146,29 @@ class CSVParser:
         raise CSVParserError(f"Impossible de lire le fichier avec les encodages: {encodings}")
     
     def _normalize_column_names(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Normalise les noms de colonnes selon le mapping"""
+        """Normalise les noms de colonnes selon le mapping (modifie df)"""
         normalized_columns = {}
         
-        for standard_name, possible_names in self.COLUMN_MAPPING.items():
-            for col in df.columns:
-                # Nettoyage du nom de colonne (espaces, accents)
-                clean_col = self._clean_text(col)
-                
-                for possible_name in possible_names:
-                    clean_possible = self._clean_text(possible_name)
-                    if clean_col.lower() == clean_possible.lower():
-                        normalized_columns[col] = standard_name
-                        break
+        for col in df.columns:
+            # Nettoyage du nom de colonne (espaces, accents)
+            clean_col = self._clean_text(col)
+            
+            standard_name = self._column_lookup.get(clean_col.lower())
+            if standard_name:
+                normalized_columns[col] = standard_name
         
-        # Renommage des colonnes
-        df_renamed = df.rename(columns=normalized_columns)
+        # Renommage sur place : le DataFrame vient d'être lu par parse_file,
+        # inutile d'en recopier toutes les colonnes
+        df.rename(columns=normalized_columns, inplace=True)
         
         # Ajout des colonnes manquantes avec valeurs par défaut
         for standard_name in self.COLUMN_MAPPING.keys():
-            if standard_name not in df_renamed.columns:
-                df_renamed[standard_name] = None
+            if standard_name not in df.columns:
+                df[standard_name] = None
         
-        # Suppression des colonnes originales pour éviter les doublons
-        original_columns_to_remove = []
-        for original_col, new_col in normalized_columns.items():
-            if original_col != new_col and original_col in df_renamed.columns:
-                original_columns_to_remove.append(original_col)
-        
-        df_renamed = df_renamed.drop(columns=original_columns_to_remove)
-                
-        return df_renamed
+        # Pas de suppression des colonnes d'origine : rename() les a déjà
+        # remplacées, et chaque nom standard se mappe sur lui-même
+        return df
     
     def _clean_text(self, text: str) -> str:
         """Nettoie le texte (espaces insécables, accents, etc.)"""
@@ -159,7 +176,7 @@ class CSVParser:
             return str(text)
             
         # Remplacement des espaces insécables par des espaces normaux
-        text = text.replace('\u00a0', ' ')
+        # ('\xa0' et '\u00a0' désignent le même caractère)
         text = text.replace('\xa0', ' ')
         
         # Suppression des espaces en début/fin
@@ -193,11 +210,10 @@ class CSVParser:
         cleaned = self._clean_text(str(value))
 
         # Suppression des unités communes
-        units_pattern = r'\s*(kg|kilogrammes?|grammes?|g|lbs?|pounds?|répétitions?|reps?)\s*'
-        cleaned = re.sub(units_pattern, '', cleaned, flags=re.IGNORECASE)
+        cleaned = _DECIMAL_UNITS_RE.sub('', cleaned)
 
         # Suppression des espaces
-        cleaned = re.sub(r'\s+', '', cleaned)
+        cleaned = _WHITESPACE_RE.sub('', cleaned)
 
         # Gestion des virgules et conversion
         try:
@@ -220,17 +236,9 @@ class CSVParser:
         Returns:
             Poids en kg (float)
         """
-        if pd.isna(weight_str) or weight_str == '':
-            return 0.0
-            
-        # Nettoyage et suppression des unités
-        cleaned = self._clean_text(str(weight_str))
-        
-        # Suppression des unités communes
-        units_pattern = r'\s*(kg|kilogrammes?|grammes?|g|lbs?|pounds?)\s*'
-        cleaned = re.sub(units_pattern, '', cleaned, flags=re.IGNORECASE)
-        
-        return self.parse_french_decimal(cleaned)
+        # parse_french_decimal nettoie déjà le texte et retire les unités de
+        # poids : un premier passage ici serait du travail en double
+        return self.parse_french_decimal(weight_str)
     
     def parse_reps(self, reps_str: str) -> int:
         """
@@ -249,7 +257,7 @@ class CSVParser:
         cleaned = self._clean_text(str(reps_str))
         
         # Extraction du nombre
-        numbers = re.findall(r'\d+', cleaned)
+        numbers = _DIGITS_RE.findall(cleaned)
         
         if numbers:
             return int(numbers[0])
@@ -272,10 +280,7 @@ class CSVParser:
             
         cleaned = self._clean_text(str(date_str))
         
-        # Formats de date supportés
-        date_formats = ['%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%Y-%m-%d']
-        
-        for fmt in date_formats:
+        for fmt in self.DATE_FORMATS:
             try:
                 return datetime.strptime(cleaned, fmt)
             except ValueError:
@@ -299,12 +304,9 @@ class CSVParser:
             
         cleaned = self._clean_text(str(bool_str)).lower()
         
-        true_values = ['oui', 'yes', 'true', '1', 'vrai']
-        false_values = ['non', 'no', 'false', '0', 'faux']
-        
-        if cleaned in true_values:
+        if cleaned in self.TRUE_VALUES:
             return True
-        elif cleaned in false_values:
+        elif cleaned in self.FALSE_VALUES:
             return False
         else:
             logger.warning(f"Valeur booléenne non reconnue '{bool_str}', retour False")
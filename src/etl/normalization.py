@@ -5,14 +5,21 @@ Transforme les données brutes en format canonique pour insertion en base.
 Inclut feature engineering basique (volume, 1RM estimé).
 """
 
+import numpy as np
 import pandas as pd
 import re
-from typing import Dict, List, Optional, Union, Tuple
+from typing import Any, Callable, List, Optional, Union
 from datetime import datetime, time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Expressions régulières compilées une seule fois au chargement du module
+_WEIGHT_UNITS_RE = re.compile(r'\s*(kg|kilogrammes?|grammes?|g|lbs?|pounds?)\s*', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+_DIGITS_RE = re.compile(r'\d+')
+_NON_SLUG_RE = re.compile(r'[^\w\s-]')
+
 
 class NormalizationError(Exception):
     """Exception spécifique à la normalisation"""
@@ -83,9 +90,37 @@ class DataNormalizer:
         'cooldown': 'cooldown'
     }
     
+    # Normalisation par colonne : (colonne source, colonne cible, méthode)
+    COLUMN_NORMALIZERS = (
+        ('date', 'date', '_normalize_date'),
+        ('time', 'time', '_normalize_time'),
+        ('training', 'training', '_normalize_text'),
+        ('exercise', 'exercise', '_normalize_exercise'),
+        ('region', 'region', '_normalize_region'),
+        ('muscles_primary', 'muscles_primary', '_normalize_muscle_list'),
+        ('muscles_secondary', 'muscles_secondary', '_normalize_muscle_list'),
+        ('series_type', 'series_type', '_normalize_series_type'),
+        ('reps', 'reps', '_normalize_reps'),
+        ('weight', 'weight_kg', '_normalize_weight'),
+        ('skipped', 'skipped', '_normalize_boolean'),
+        ('notes', 'notes', '_normalize_text')
+    )
+    
+    # Formats de date et d'heure supportés
+    DATE_FORMATS = ('%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%Y-%m-%d')
+    TIME_FORMATS = ('%H:%M', '%H:%M:%S', '%H.%M', '%Hh%M')
+    
+    # Valeurs considérées comme vraies (recherche O(1))
+    TRUE_VALUES = frozenset(['oui', 'yes', 'true', '1', 'vrai'])
+    
     def __init__(self):
         """Initialise le normalisateur"""
-        pass
+        # Motifs d'exercices en minuscules, calculés une seule fois
+        self._exercise_patterns = tuple(
+            (pattern.lower(), canonical)
+            for pattern, canonical in self.EXERCISE_MAPPING.items()
+        )
+
     
     def normalize_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -100,19 +135,11 @@ class DataNormalizer:
         try:
             df_normalized = df.copy()
             
-            # Normalisation par colonne
-            df_normalized['date'] = df_normalized['date'].apply(self._normalize_date)
-            df_normalized['time'] = df_normalized['time'].apply(self._normalize_time)
-            df_normalized['training'] = df_normalized['training'].apply(self._normalize_text)
-            df_normalized['exercise'] = df_normalized['exercise'].apply(self._normalize_exercise)
-            df_normalized['region'] = df_normalized['region'].apply(self._normalize_region)
-            df_normalized['muscles_primary'] = df_normalized['muscles_primary'].apply(self._normalize_muscle_list)
-            df_normalized['muscles_secondary'] = df_normalized['muscles_secondary'].apply(self._normalize_muscle_list)
-            df_normalized['series_type'] = df_normalized['series_type'].apply(self._normalize_series_type)
-            df_normalized['reps'] = df_normalized['reps'].apply(self._normalize_reps)
-            df_normalized['weight_kg'] = df_normalized['weight'].apply(self._normalize_weight)
-            df_normalized['skipped'] = df_normalized['skipped'].apply(self._normalize_boolean)
-            df_normalized['notes'] = df_normalized['notes'].apply(self._normalize_text)
+            # Normalisation par colonne, pilotée par COLUMN_NORMALIZERS (méthodes
+            # résolues à l'appel, pour suivre une méthode remplacée)
+            for source, target, method_name in self.COLUMN_NORMALIZERS:
+                normalize = getattr(self, method_name)
+                df_normalized[target] = self._apply_per_unique(df_normalized[source], normalize)
             
             # Suppression de la colonne 'weight' originale
             if 'weight' in df_normalized.columns:
@@ -131,6 +158,42 @@ class DataNormalizer:
         except Exception as e:
             raise NormalizationError(f"Erreur lors de la normalisation: {str(e)}")
     
+    def _apply_per_unique(self, series: pd.Series, normalize: Callable[[Any], Any]) -> pd.Series:
+        """
+        Applique une fonction de normalisation une seule fois par valeur distincte.
+        
+        Les colonnes (dates, exercices, régions...) se répètent fortement d'une
+        série à l'autre : le résultat est calculé par valeur unique puis
+        redistribué par indexation. Les valeurs manquantes (code -1) reçoivent
+        normalize(None).
+        
+        Réservé aux colonnes de texte : factorize confond 1, 1.0 et True, que
+        les normaliseurs traitent différemment ; sinon apply() classique.
+        """
+        if pd.api.types.infer_dtype(series, skipna=True) != 'string':
+            return series.apply(normalize)
+        
+        codes, uniques = pd.factorize(series)
+        
+        # Remplissage élément par élément : les listes de muscles ne doivent
+        # pas être dépliées par numpy ; la dernière case sert au code -1
+        results = np.empty(len(uniques) + 1, dtype=object)
+        for i, value in enumerate(uniques):
+            results[i] = normalize(value)
+        results[-1] = normalize(None)
+        
+        values = results[codes]
+        
+        # Listes mutables : chaque ligne reçoit sa propre copie, comme avec
+        # apply(), pour ne pas partager un objet entre lignes identiques
+        if any(isinstance(result, list) for result in results):
+            for i, value in enumerate(values):
+                if isinstance(value, list):
+                    values[i] = list(value)
+        
+        # infer_objects restaure les types int/float/bool obtenus avec apply()
+        return pd.Series(values, index=series.index).infer_objects()
+    
     def _normalize_date(self, date_value: Union[str, datetime, None]) -> Optional[str]:
         """Normalise une date en format ISO (YYYY-MM-DD)"""
         if pd.isna(date_value) or date_value is None:
@@ -141,9 +204,8 @@ class DataNormalizer:
         
         # Parse date française
         cleaned = self._clean_text(str(date_value))
-        date_formats = ['%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%Y-%m-%d']
         
-        for fmt in date_formats:
+        for fmt in self.DATE_FORMATS:
             try:
                 parsed_date = datetime.strptime(cleaned, fmt)
                 return parsed_date.strftime('%Y-%m-%d')
@@ -162,9 +224,8 @@ class DataNormalizer:
             return time_value.strftime('%H:%M')
             
         cleaned = self._clean_text(str(time_value))
-        time_formats = ['%H:%M', '%H:%M:%S', '%H.%M', '%Hh%M']
         
-        for fmt in time_formats:
+        for fmt in self.TIME_FORMATS:
             try:
                 parsed_time = datetime.strptime(cleaned, fmt).time()
                 return parsed_time.strftime('%H:%M')
@@ -182,13 +243,13 @@ class DataNormalizer:
         cleaned = self._clean_text(str(exercise_name)).lower()
         
         # Recherche fuzzy dans le mapping
-        for pattern, canonical in self.EXERCISE_MAPPING.items():
-            if pattern.lower() in cleaned or cleaned in pattern.lower():
+        for pattern, canonical in self._exercise_patterns:
+            if pattern in cleaned or cleaned in pattern:
                 return canonical
         
         # Si pas trouvé, retourne une version nettoyée
-        canonical = re.sub(r'[^\w\s-]', '', cleaned)
-        canonical = re.sub(r'\s+', '-', canonical.strip())
+        canonical = _NON_SLUG_RE.sub('', cleaned)
+        canonical = _WHITESPACE_RE.sub('-', canonical.strip())
         
         if not canonical:
             return 'unknown'
@@ -203,6 +264,11 @@ class DataNormalizer:
             
         cleaned = self._clean_text(str(region)).lower()
         
+        # Correspondance exacte : accès direct avant la recherche par motif
+        canonical = self.REGION_MAPPING.get(cleaned)
+        if canonical:
+            return canonical
+        
         for pattern, canonical in self.REGION_MAPPING.items():
             if pattern in cleaned:
                 return canonical
@@ -228,6 +294,11 @@ class DataNormalizer:
             
         cleaned = self._clean_text(str(series_type)).lower()
         
+        # Correspondance exacte : accès direct avant la recherche par motif
+        canonical = self.SERIES_TYPE_MAPPING.get(cleaned)
+        if canonical:
+            return canonical
+        
         for pattern, canonical in self.SERIES_TYPE_MAPPING.items():
             if pattern in cleaned:
                 return canonical
@@ -244,7 +315,7 @@ class DataNormalizer:
             
         # Extraction du nombre depuis string
         cleaned = self._clean_text(str(reps_value))
-        numbers = re.findall(r'\d+', cleaned)
+        numbers = _DIGITS_RE.findall(cleaned)
         
         if numbers:
             return int(numbers[0])
@@ -263,8 +334,7 @@ class DataNormalizer:
         cleaned = self._clean_text(str(weight_value))
         
         # Suppression des unités
-        units_pattern = r'\s*(kg|kilogrammes?|grammes?|g|lbs?|pounds?)\s*'
-        cleaned = re.sub(units_pattern, '', cleaned, flags=re.IGNORECASE)
+        cleaned = _WEIGHT_UNITS_RE.sub('', cleaned)
         
         # Remplacement virgule par point
         cleaned = cleaned.replace(',', '.')
@@ -284,9 +354,7 @@ class DataNormalizer:
             return bool_value
             
         cleaned = self._clean_text(str(bool_value)).lower()
-        
-        true_values = ['oui', 'yes', 'true', '1', 'vrai']
-        return cleaned in true_values
+        return cleaned in self.TRUE_VALUES
     
     def _normalize_text(self, text_value: str) -> Optional[str]:
         """Normalise un texte général"""
@@ -301,23 +369,27 @@ class DataNormalizer:
         if not isinstance(text, str):
             return str(text)
             
-        # Remplacement espaces insécables
-        text = text.replace('\u00a0', ' ').replace('\xa0', ' ')
-        
-        # Nettoyage espaces multiples
-        text = re.sub(r'\s+', ' ', text.strip())
-        
-        return text
+        # Un seul passage : split() découpe sur tous les blancs Unicode
+        # (espaces insécables compris), ce qui trime et compacte à la fois
+        return ' '.join(text.split())
     
     def _add_computed_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Ajoute des features calculées"""
-        df = df.copy()
+        """
+        Ajoute des features calculées.
         
+        Modifie le DataFrame reçu : normalize_dataframe lui passe déjà sa
+        propre copie, une seconde copie complète serait inutile.
+        """
         # Volume par série (reps * poids)
         df['volume'] = df['reps'] * df['weight_kg']
         
-        # 1RM estimé (formule d'Epley)
-        df['estimated_1rm'] = df.apply(self._calculate_1rm, axis=1)
+        # 1RM estimé (formule d'Epley), vectorisé : même règle que _calculate_1rm
+        # sans rappel Python par ligne
+        reps = df['reps'].to_numpy(dtype=float)
+        weight = df['weight_kg'].to_numpy(dtype=float)
+        skipped = df['skipped'].to_numpy(dtype=bool)
+        valid = (reps > 0) & (weight > 0) & ~skipped
+        df['estimated_1rm'] = np.where(valid, weight * (1 + reps / 30), 0.0)
         
         # Indicateur de série valide
         df['is_valid_set'] = (df['reps'] > 0) & (~df['skipped'])
@@ -340,11 +412,12 @@ class DataNormalizer:
         """Supprime les lignes avec des données invalides"""
         initial_count = len(df)
         
-        # Suppression des lignes sans exercice
-        df = df[df['exercise'].notna() & (df['exercise'] != '')]
-        
-        # Suppression des lignes sans date valide
-        df = df[df['date'].notna()]
+        # Suppression des lignes sans exercice ou sans date valide, en un
+        # seul filtrage (pas de DataFrame intermédiaire)
+        valid_rows = (
+            df['exercise'].notna() & (df['exercise'] != '') & df['date'].notna()
+        )
+        df = df[valid_rows]
         
         final_count = len(df)
         
@@ -4,9 +4,10 @@ Pipeline ETL principal pour Muscle-Analytics.
 Orchestrateur qui combine parsing et normalisation.
 """
 
+import hashlib
 import pandas as pd
 from pathlib import Path
-from typing import Optional, Union, List
+from typing import Union, List, Optional
 import logging
 
 from .csv_parser import CSVParser, CSVParserError
@@ -24,6 +25,16 @@ class ETLPipelineError(Exception):
 class ETLPipeline:
     """Pipeline ETL complet pour les données d'entraînement"""
     
+    # Taille des blocs lus pour l'empreinte des fichiers (1 Mo)
+    HASH_CHUNK_SIZE = 1 << 20
+    
+    # Attribut du parser à utiliser selon l'extension (résolu à l'appel,
+    # pour suivre un parser remplacé après construction)
+    PARSER_ATTRIBUTES = {
+        '.csv': 'csv_parser',
+        '.xml': 'xml_parser'
+    }
+    
     def __init__(self):
         """Initialise le pipeline ETL"""
         self.csv_parser = CSVParser()
@@ -55,13 +66,12 @@ class ETLPipeline:
             logger.info(f"Traitement du fichier: {file_path} (format: {file_extension})")
             
             # Parsing selon le format
-            if file_extension == '.csv':
-                raw_df = self.csv_parser.parse_file(file_path)
-            elif file_extension == '.xml':
-                raw_df = self.xml_parser.parse_file(file_path)
-            else:
+            parser_attribute = self.PARSER_ATTRIBUTES.get(file_extension)
+            if parser_attribute is None:
                 raise ETLPipelineError(f"Format de fichier non supporté: {file_extension}")
             
+            raw_df = getattr(self, parser_attribute).parse_file(file_path)
+            
             if raw_df.empty:
                 logger.warning(f"Aucune donnée extraite du fichier: {file_path}")
                 return pd.DataFrame()
@@ -82,6 +92,11 @@ class ETLPipeline:
         """
         Traite plusieurs fichiers et combine les résultats.
         
+        Un fichier dont le contenu a déjà été traité avec succès dans cet
+        appel (même sous un autre nom) est ignoré. La déduplication ne vaut
+        que pour l'appel en cours, et chaque fichier non dupliqué est lu deux
+        fois sur disque (empreinte, puis parsing).
+        
         Args:
             file_paths: Liste des chemins de fichiers à traiter
             
@@ -89,10 +104,23 @@ class ETLPipeline:
             DataFrame combiné et normalisé
         """
         combined_data = []
+        seen_digests = set()
         
         for file_path in file_paths:
             try:
+                # Empreinte du contenu : un fichier déjà traité (même sous un
+                # autre nom) est ignoré sans repasser par le parsing
+                digest = self._file_digest(file_path)
+                if digest in seen_digests:
+                    logger.warning(f"Fichier en double ignoré: {file_path}")
+                    continue
+                
                 df = self.process_file(file_path)
+                
+                # Empreinte retenue seulement après un traitement réussi : un
+                # échec (format non supporté...) ne masque pas une copie valide
+                seen_digests.add(digest)
+                
                 if not df.empty:
                     # Ajout de métadonnées sur la source
                     df['source_file'] = str(Path(file_path).name)
@@ -116,18 +144,34 @@ class ETLPipeline:
         
         return final_df
     
+    def _file_digest(self, file_path: Union[str, Path]) -> str:
+        """Calcule l'empreinte BLAKE2b d'un fichier, lu par blocs"""
+        digest = hashlib.blake2b(digest_size=16)
+        
+        try:
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(self.HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+        except OSError as e:
+            raise ETLPipelineError(f"Fichier illisible: {file_path} ({e})")
+        
+        return digest.hexdigest()
+    
     def _sort_by_datetime(self, df: pd.DataFrame) -> pd.DataFrame:
         """Trie le DataFrame par date et heure"""
         if 'date' in df.columns:
-            # Conversion en datetime pour le tri
-            df['_sort_datetime'] = pd.to_datetime(df['date'], errors='coerce')
+            # Conversion en datetime pour le tri (dates déjà ISO après
+            # normalisation : format explicite, sans inférence)
+            df['_sort_datetime'] = pd.to_datetime(df['date'], format='%Y-%m-%d', errors='coerce')
             
-            # Ajout de l'heure si disponible
+            # Ajout de l'heure si disponible (vectorisé : jour + décalage horaire)
             if 'time' in df.columns:
-                time_series = pd.to_datetime(df['time'], format='%H:%M', errors='coerce').dt.time
-                for i, (date, time_val) in enumerate(zip(df['_sort_datetime'], time_series)):
-                    if pd.notna(date) and pd.notna(time_val):
-                        df.loc[i, '_sort_datetime'] = pd.Timestamp.combine(date.date(), time_val)
+                times = pd.to_datetime(df['time'], format='%H:%M', errors='coerce')
+                time_offsets = times - times.dt.normalize()
+                df['_sort_datetime'] = df['_sort_datetime'].where(
+                    times.isna(),
+                    df['_sort_datetime'].dt.normalize() + time_offsets
+                )
             
             # Tri et suppression de la colonne temporaire
             df = df.sort_values('_sort_datetime', na_position='last')
@@ -146,8 +190,9 @@ class ETLPipeline:
         Returns:
             Dictionnaire avec métriques de qualité
         """
+        total_rows = len(df)
         quality_metrics = {
-            'total_rows': len(df),
+            'total_rows': total_rows,
             'valid_sets': 0,
             'missing_dates': 0,
             'missing_exercises': 0,
@@ -159,43 +204,48 @@ class ETLPipeline:
         if df.empty:
             return quality_metrics
         
-        # Calcul des métriques
-        if 'is_valid_set' in df.columns:
+        # Calcul des métriques (colonnes lues une seule fois)
+        columns = df.columns
+        
+        if 'is_valid_set' in columns:
             quality_metrics['valid_sets'] = df['is_valid_set'].sum()
         
-        if 'date' in df.columns:
+        if 'date' in columns:
             quality_metrics['missing_dates'] = df['date'].isna().sum()
         
-        if 'exercise' in df.columns:
+        if 'exercise' in columns:
+            exercises = df['exercise']
             quality_metrics['missing_exercises'] = (
-                df['exercise'].isna() | (df['exercise'] == 'unknown')
+                exercises.isna() | (exercises == 'unknown')
             ).sum()
         
-        if 'weight_kg' in df.columns:
+        if 'weight_kg' in columns:
             quality_metrics['invalid_weights'] = (df['weight_kg'] < 0).sum()
         
-        if 'reps' in df.columns:
+        if 'reps' in columns:
             quality_metrics['invalid_reps'] = (df['reps'] <= 0).sum()
         
-        if 'skipped' in df.columns:
+        if 'skipped' in columns:
             quality_metrics['skipped_sets'] = df['skipped'].sum()
         
         # Calcul du pourcentage de qualité
-        if quality_metrics['total_rows'] > 0:
+        if total_rows > 0:
             quality_metrics['quality_percentage'] = (
-                quality_metrics['valid_sets'] / quality_metrics['total_rows'] * 100
+                quality_metrics['valid_sets'] / total_rows * 100
             )
         else:
             quality_metrics['quality_percentage'] = 0.0
         
         return quality_metrics
     
-    def generate_summary_report(self, df: pd.DataFrame) -> str:
+    def generate_summary_report(self, df: pd.DataFrame, quality: Optional[dict] = None) -> str:
         """
         Génère un rapport de synthèse des données.
         
         Args:
             df: DataFrame normalisé
+            quality: Métriques déjà calculées par validate_data_quality(df),
+                recalculées si absentes
             
         Returns:
             Rapport sous forme de string
@@ -203,14 +253,18 @@ class ETLPipeline:
         if df.empty:
             return "Aucune donnée à analyser."
         
-        quality = self.validate_data_quality(df)
+        if quality is None:
+            quality = self.validate_data_quality(df)
         
-        # Statistiques de base
-        unique_exercises = df['exercise'].nunique() if 'exercise' in df.columns else 0
+        # Statistiques de base (un seul comptage sert au total et au top)
+        exercise_counts = (
+            df['exercise'].value_counts(sort=False) if 'exercise' in df.columns else None
+        )
+        unique_exercises = len(exercise_counts) if exercise_counts is not None else 0
         date_range = None
         
         if 'date' in df.columns and not df['date'].isna().all():
-            dates = pd.to_datetime(df['date'], errors='coerce').dropna()
+            dates = pd.to_datetime(df['date'], format='%Y-%m-%d', errors='coerce').dropna()
             if not dates.empty:
                 date_range = f"{dates.min().strftime('%Y-%m-%d')} à {dates.max().strftime('%Y-%m-%d')}"
         
@@ -239,10 +293,13 @@ class ETLPipeline:
 """
         
         # Top exercices
-        if 'exercise' in df.columns:
-            top_exercises = df['exercise'].value_counts().head(5)
-            for exercise, count in top_exercises.items():
-                report += f"- {exercise}: {count} séries\n"
+        if exercise_counts is not None:
+            # Sélection partielle : inutile de trier tous les exercices
+            top_exercises = exercise_counts.nlargest(5)
+            report += "".join(
+                f"- {exercise}: {count} séries\n"
+                for exercise, count in top_exercises.items()
+            )
         
         return report
 
@@ -4,6 +4,7 @@ Parser XML robuste pour les fichiers d'entraînement de musculation.
 Support des formats XML avec structure flexible et validation.
 """
 
+import re
 import xml.etree.ElementTree as ET
 import pandas as pd
 from pathlib import Path
@@ -38,6 +39,15 @@ class XMLParser:
         'skipped': ['skipped', 'sautee', 'sautée', 'skip']
     }
     
+    # Patterns de recherche pour les éléments d'enregistrement
+    RECORD_PATTERNS = (
+        'log', 'logs/log', './/log',
+        'workout', 'workouts/workout', './/workout',
+        'session', 'sessions/session', './/session',
+        'set', 'sets/set', './/set',
+        'entry', 'entries/entry', './/entry'
+    )
+    
     def __init__(self, encoding: str = 'utf-8'):
         """
         Initialise le parser XML.
@@ -46,6 +56,16 @@ class XMLParser:
             encoding: Encodage du fichier XML
         """
         self.encoding = encoding
+        
+        # Index tag (minuscules) -> colonne, construit une seule fois
+        self._tag_lookup = {}
+        for column, possible_tags in self.TAG_MAPPING.items():
+            for possible_tag in possible_tags:
+                self._tag_lookup.setdefault(possible_tag.lower(), column)
+        
+        # Cache tag brut -> colonne : un document ne contient que quelques
+        # tags distincts, répétés pour chaque enregistrement
+        self._column_cache: Dict[str, Optional[str]] = {}
     
     def parse_file(self, file_path: Union[str, Path]) -> pd.DataFrame:
         """
@@ -66,21 +86,14 @@ class XMLParser:
                 raise XMLParserError(f"Fichier non trouvé: {file_path}")
             
             # Parse du XML
-            tree = self._parse_xml_file(file_path)
-            root = tree.getroot()
+            root = self._parse_xml_file(file_path)
             
-            # Extraction des données
-            data_records = self._extract_records(root)
+            # Extraction des données et conversion en DataFrame
+            df = self._build_dataframe(root)
             
-            if not data_records:
+            if df.empty:
                 logger.warning(f"Aucune donnée extraite du fichier XML: {file_path}")
-                return pd.DataFrame()
-            
-            # Conversion en DataFrame
-            df = pd.DataFrame(data_records)
-            
-            # Normalisation des colonnes
-            df = self._normalize_columns(df)
+                return df
             
             logger.info(f"XML parsé avec succès: {len(df)} lignes, colonnes: {list(df.columns)}")
             
@@ -91,21 +104,35 @@ class XMLParser:
         except Exception as e:
             raise XMLParserError(f"Erreur lors du parsing XML {file_path}: {str(e)}")
     
-    def _parse_xml_file(self, file_path: Path) -> ET.ElementTree:
+    def _build_dataframe(self, root: ET.Element) -> pd.DataFrame:
+        """Construit le DataFrame normalisé (partagé par parse_file et parse_string)"""
+        data_records = self._extract_records(root)
+        
+        if not data_records:
+            return pd.DataFrame()
+        
+        df = pd.DataFrame(data_records)
+        
+        # Normalisation des colonnes
+        return self._normalize_columns(df)
+    
+    def _parse_xml_file(self, file_path: Path) -> ET.Element:
         """Parse le fichier XML avec gestion des encodages"""
         encodings = [self.encoding, 'utf-8', 'cp1252', 'iso-8859-1']
         
+        # Lecture unique du fichier, seul le décodage est retenté
+        raw_content = file_path.read_bytes()
+        
         for encoding in encodings:
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    content = f.read()
+                content = raw_content.decode(encoding)
                 
                 # Nettoyage du contenu XML si nécessaire
                 content = self._clean_xml_content(content)
                 
-                tree = ET.fromstring(content)
+                root = ET.fromstring(content)
                 logger.debug(f"XML lu avec l'encodage {encoding}")
-                return ET.ElementTree(tree)
+                return root
                 
             except (UnicodeDecodeError, ET.ParseError):
                 continue
@@ -118,7 +145,7 @@ class XMLParser:
         content = content.replace('\x00', '')
         
         # Remplacement des espaces insécables
-        content = content.replace('\u00a0', ' ')
+        # ('\xa0' et '\u00a0' désignent le même caractère)
         content = content.replace('\xa0', ' ')
         
         return content
@@ -146,16 +173,7 @@ class XMLParser:
     
     def _find_record_elements(self, root: ET.Element) -> List[ET.Element]:
         """Trouve les éléments contenant les enregistrements individuels"""
-        # Patterns de recherche pour les éléments d'enregistrement
-        record_patterns = [
-            'log', 'logs/log', './/log',
-            'workout', 'workouts/workout', './/workout',
-            'session', 'sessions/session', './/session',
-            'set', 'sets/set', './/set',
-            'entry', 'entries/entry', './/entry'
-        ]
-        
-        for pattern in record_patterns:
+        for pattern in self.RECORD_PATTERNS:
             elements = root.findall(pattern)
             if elements:
                 logger.debug(f"Trouvé {len(elements)} éléments avec le pattern '{pattern}'")
@@ -203,15 +221,18 @@ class XMLParser:
     
     def _map_tag_to_column(self, tag: str) -> Optional[str]:
         """Mappe un tag XML vers un nom de colonne standardisé"""
+        if tag in self._column_cache:
+            return self._column_cache[tag]
+        
         tag_cleaned = self._clean_tag_name(tag)
         
-        for column, possible_tags in self.TAG_MAPPING.items():
-            for possible_tag in possible_tags:
-                if tag_cleaned.lower() == possible_tag.lower():
-                    return column
+        column = self._tag_lookup.get(tag_cleaned.lower())
+        if not column:
+            # Si pas de mapping trouvé, utilise le tag nettoyé
+            column = tag_cleaned if tag_cleaned else None
         
-        # Si pas de mapping trouvé, utilise le tag nettoyé
-        return tag_cleaned if tag_cleaned else None
+        self._column_cache[tag] = column
+        return column
     
     def _clean_tag_name(self, tag: str) -> str:
         """Nettoie un nom de tag XML"""
@@ -220,7 +241,6 @@ class XMLParser:
             tag = tag.split('}')[1]
         
         # Nettoyage des caractères spéciaux
-        import re
         tag = re.sub(r'[^\w]', '_', tag)
         tag = tag.strip('_')
         
@@ -238,8 +258,7 @@ class XMLParser:
         value = value.replace('&quot;', '"')
         value = value.replace('&apos;', "'")
         
-        # Nettoyage des espaces
-        value = value.replace('\u00a0', ' ')
+        # Nettoyage des espaces (un seul passage : '\u00a0' == '\xa0')
         value = value.replace('\xa0', ' ')
         value = value.strip()
         
@@ -250,7 +269,6 @@ class XMLParser:
         record = {}
         
         # Pattern simple pour "key: value" ou "key=value"
-        import re
         patterns = [
             r'(\w+):\s*([^\n,]+)',
             r'(\w+)=([^\n,]+)',
@@ -268,11 +286,6 @@ class XMLParser:
     
     def _normalize_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Normalise les colonnes du DataFrame"""
-        # Ajout des colonnes manquantes
-        for standard_column in self.TAG_MAPPING.keys():
-            if standard_column not in df.columns:
-                df[standard_column] = None
-        
         # Réorganisation des colonnes dans un ordre logique
         column_order = [
             'date', 'time', 'training', 'exercise', 'region',
@@ -282,12 +295,13 @@ class XMLParser:
         
         # Ajout des colonnes supplémentaires non prévues
         extra_columns = [col for col in df.columns if col not in column_order]
-        final_columns = column_order + extra_columns
         
-        # Filtrage des colonnes existantes
-        existing_columns = [col for col in final_columns if col in df.columns]
+        # Colonnes manquantes ajoutées en objet None (un reindex les créerait
+        # en float64 NaN), puis une seule sélection les réordonne
+        missing_columns = [col for col in column_order if col not in df.columns]
+        df = df.assign(**dict.fromkeys(missing_columns))
         
-        return df[existing_columns]
+        return df[column_order + extra_columns]
     
     def parse_string(self, xml_content: str) -> pd.DataFrame:
         """
@@ -303,15 +317,7 @@ class XMLParser:
             xml_content = self._clean_xml_content(xml_content)
             root = ET.fromstring(xml_content)
             
-            data_records = self._extract_records(root)
-            
-            if not data_records:
-                return pd.DataFrame()
-            
-            df = pd.DataFrame(data_records)
-            df = self._normalize_columns(df)
-            
-            return df
+            return self._build_dataframe(root)
             
         except ET.ParseError as e:
             raise XMLParserError(f"Erreur de format XML: {str(e)}")
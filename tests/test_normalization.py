@@ -43,6 +43,13 @@ class TestDataNormalizer:
         assert df_norm['date'].iloc[0] == '2025-08-29'
         assert df_norm['exercise'].iloc[0] == 'pull-up'
     
+    def test_replaced_normalizer_is_used(self, normalizer, sample_raw_dataframe):
+        """Test méthode de normalisation remplacée après construction"""
+        normalizer._normalize_text = lambda value: 'remplacé'
+        df_norm = normalizer.normalize_dataframe(sample_raw_dataframe)
+        
+        assert list(df_norm['notes']) == ['remplacé', 'remplacé']
+    
     def test_normalize_date(self, normalizer):
         """Test normalisation des dates"""
         assert normalizer._normalize_date('29/08/2025') == '2025-08-29'
@@ -72,4 +79,39 @@ class TestDataNormalizer:
         assert abs(normalizer._calculate_1rm(row) - expected) < 0.01
         
         row_skipped = pd.Series({'reps': 8, 'weight_kg': 80.0, 'skipped': True})
-        assert normalizer._calculate_1rm(row_skipped) == 0.0
\ No newline at end of file
+        assert normalizer._calculate_1rm(row_skipped) == 0.0
+    
+    def test_estimated_1rm_column(self, normalizer, sample_raw_dataframe):
+        """Test 1RM vectorisé cohérent avec _calculate_1rm"""
+        df_norm = normalizer.normalize_dataframe(sample_raw_dataframe)
+        
+        # Poids nul -> 1RM nul
+        assert df_norm['estimated_1rm'].iloc[0] == 0.0
+        
+        for _, row in df_norm.iterrows():
+            assert abs(row['estimated_1rm'] - normalizer._calculate_1rm(row)) < 0.01
+    
+    def test_apply_per_unique(self, normalizer):
+        """Test normalisation par valeur unique équivalente à apply()"""
+        series = pd.Series(['8', '12 reps', None, '8'], dtype=object)
+        
+        reps = normalizer._apply_per_unique(series, normalizer._normalize_reps)
+        assert reps.tolist() == [8, 12, 0, 8]
+        assert reps.dtype == series.apply(normalizer._normalize_reps).dtype
+        
+        muscles = normalizer._apply_per_unique(series, normalizer._normalize_muscle_list)
+        assert muscles.tolist() == [['8'], ['12 reps'], [], ['8']]
+        
+        # Chaque ligne possède sa propre liste (pas d'objet partagé)
+        muscles.iloc[0].append('Fessiers')
+        assert muscles.iloc[3] == ['8']
+        
+        missing = pd.Series([None, None], dtype=object)
+        empty_lists = normalizer._apply_per_unique(missing, normalizer._normalize_muscle_list)
+        assert empty_lists.iloc[0] is not empty_lists.iloc[1]
+        
+        # Types mélangés : 1, 1.0 et True ne doivent pas être confondus
+        mixed = pd.Series([1, 1.0, True, '1'], dtype=object)
+        booleans = normalizer._apply_per_unique(mixed, normalizer._normalize_boolean)
+        assert booleans.tolist() == mixed.apply(normalizer._normalize_boolean).tolist()
+        assert booleans.tolist() == [True, False, True, True]
@@ -0,0 +1,118 @@
+"""
+Tests unitaires pour le pipeline ETL.
+"""
+
+import pytest
+import pandas as pd
+from src.etl.csv_parser import CSVParser
+from src.etl.pipeline import ETLPipeline, ETLPipelineError
+
+
+class TestETLPipeline:
+    """Tests pour la classe ETLPipeline"""
+
+    @pytest.fixture
+    def pipeline(self):
+        return ETLPipeline()
+
+    def test_sort_by_datetime(self, pipeline):
+        """Test tri par date puis heure"""
+        df = pd.DataFrame({
+            'date': ['2025-08-30', '2025-08-29', '2025-08-29', None],
+            'time': ['09:00', '16:10', '16:05', '08:00'],
+            'exercise': ['squat', 'bench-press', 'pull-up', 'dips']
+        })
+
+        df_sorted = pipeline._sort_by_datetime(df)
+
+        assert list(df_sorted['exercise']) == ['pull-up', 'bench-press', 'squat', 'dips']
+        assert '_sort_datetime' not in df_sorted.columns
+
+    def test_sort_by_datetime_missing_time(self, pipeline):
+        """Test tri avec heures manquantes"""
+        df = pd.DataFrame({
+            'date': ['2025-08-29', '2025-08-29'],
+            'time': ['10:00', None],
+            'exercise': ['squat', 'pull-up']
+        })
+
+        df_sorted = pipeline._sort_by_datetime(df)
+
+        # Sans heure, la série est placée à minuit
+        assert list(df_sorted['exercise']) == ['pull-up', 'squat']
+
+    def test_summary_report_reuses_quality(self, pipeline):
+        """Test rapport identique avec métriques de qualité précalculées"""
+        df = pd.DataFrame({
+            'date': ['2025-08-29', '2025-08-30'],
+            'exercise': ['squat', 'squat'],
+            'reps': [8, 5],
+            'weight_kg': [100.0, 110.0],
+            'skipped': [False, False],
+            'is_valid_set': [True, True],
+            'volume': [800.0, 550.0]
+        })
+
+        quality = pipeline.validate_data_quality(df)
+
+        assert pipeline.generate_summary_report(df, quality) == pipeline.generate_summary_report(df)
+
+    def test_process_multiple_files_skips_duplicates(self, pipeline, tmp_path):
+        """Test fichiers au contenu identique traités une seule fois"""
+        content = """Date,Exercice,Répétitions,Poids
+29/08/2025,Squat,8,"100,0 kg"
+30/08/2025,Squat,5,"110,0 kg"
+"""
+        first = tmp_path / 'seance.csv'
+        copy = tmp_path / 'seance_copie.csv'
+        first.write_text(content, encoding='utf-8')
+        copy.write_text(content, encoding='utf-8')
+
+        df = pipeline.process_multiple_files([first, copy, first])
+
+        assert len(df) == 2
+        assert set(df['source_file']) == {'seance.csv'}
+
+    def test_process_multiple_files_missing_file(self, pipeline, tmp_path):
+        """Test fichier inexistant ignoré"""
+        df = pipeline.process_multiple_files([tmp_path / 'absent.csv'])
+
+        assert df.empty
+
+    def test_process_file_unsupported_format(self, pipeline, tmp_path):
+        """Test format de fichier non supporté"""
+        json_file = tmp_path / 'seance.json'
+        json_file.write_text('{}', encoding='utf-8')
+
+        with pytest.raises(ETLPipelineError):
+            pipeline.process_file(json_file)
+
+    def test_process_file_uses_current_parser(self, pipeline, tmp_path):
+        """Test parser remplacé après construction bien utilisé"""
+        csv_file = tmp_path / 'seance.csv'
+        csv_file.write_text('Date,Exercice,Répétitions,Poids\n29/08/2025,Squat,8,100\n', encoding='utf-8')
+        calls = []
+
+        class RecordingParser(CSVParser):
+            def parse_file(self, file_path):
+                calls.append(file_path)
+                return super().parse_file(file_path)
+
+        pipeline.csv_parser = RecordingParser(encoding='cp1252')
+        df = pipeline.process_file(csv_file)
+
+        assert calls == [csv_file]
+        assert len(df) == 1
+
+    def test_failed_file_does_not_mask_duplicate(self, pipeline, tmp_path):
+        """Test copie valide traitée après l'échec d'un fichier identique"""
+        content = 'Date,Exercice,Répétitions,Poids\n29/08/2025,Squat,8,"100,0 kg"\n'
+        unsupported = tmp_path / 'seance.txt'
+        valid = tmp_path / 'seance.csv'
+        unsupported.write_text(content, encoding='utf-8')
+        valid.write_text(content, encoding='utf-8')
+
+        df = pipeline.process_multiple_files([unsupported, valid])
+
+        assert len(df) == 1
+        assert set(df['source_file']) == {'seance.csv'}
@@ -148,6 +148,16 @@ class TestXMLParser:
         
         # Doit retourner un DataFrame vide mais pas lever d'erreur
         assert df.empty or len(df) == 0
+    
+    def test_missing_columns_are_none(self, parser):
+        """Test colonnes absentes du XML ajoutées en objet None"""
+        xml_content = '<logs><log date="29/08/2025"><exercise>Squat</exercise></log></logs>'
+        df = parser.parse_string(xml_content)
+        
+        assert list(df.columns[:3]) == ['date', 'time', 'training']
+        assert df['notes'].dtype == object
+        assert df.iloc[0]['notes'] is None
+        assert df.iloc[0]['weight'] is None
 
 
 class TestXMLParserIntegration: